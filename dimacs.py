@@ -0,0 +1,137 @@
+import os
+import subprocess
+import tempfile
+
+# bytes reserved at the start of the file for the problem line, the counts are only known once every clause has been
+# written so the header is patched in place when the writer is closed
+HEADER_SIZE = 64
+
+
+class DimacsWriter:
+    """
+    DimacsWriter streams clauses to a file in DIMACS CNF format as they are appended, no clause is kept in memory. The
+    file has to be seekable so the problem line can be filled in when the writer is closed.
+    """
+
+    def __init__(self, f, header: bool = True):
+        """
+        Constructor for the DimacsWriter class
+        :param f: seekable file object opened for writing text
+        :param header: whether to reserve space for the problem line, writers of a part of a file have none and need no
+        seekable file
+        """
+        self.f = f
+        self.num_vars = 0
+        self.num_clauses = 0
+        if header:
+            self.f.write("c" + " " * (HEADER_SIZE - 2) + "\n")
+
+    def append(self, clause: list):
+        """
+        writes a single clause to the file
+        :param clause: list of non zero ints, negative ints are negated literals
+        """
+        for elem in clause:
+            if abs(elem) > self.num_vars:
+                self.num_vars = abs(elem)
+        self.f.write(" ".join(str(elem) for elem in clause) + " 0\n")
+        self.num_clauses += 1
+
+    def append_lines(self, chunks, num_clauses: int, num_vars: int):
+        """
+        writes clauses that were already formatted as DIMACS lines, such as the bands of a file written in parallel
+        :param chunks: iterable of strings holding whole clause lines once joined
+        :param num_clauses: number of clauses in the lines
+        :param num_vars: largest variable in the lines
+        """
+        for chunk in chunks:
+            self.f.write(chunk)
+        self.num_clauses += num_clauses
+        self.num_vars = max(self.num_vars, num_vars)
+
+    def close(self):
+        """
+        writes the problem line into the space reserved at the start of the file, the rest of the reserved space is
+        filled with a comment so the clauses do not have to be moved
+        """
+        header = "p cnf " + str(self.num_vars) + " " + str(self.num_clauses) + "\n"
+        if len(header) > HEADER_SIZE - 2:
+            raise Exception("DIMACS header does not fit in the reserved space")
+        self.f.flush()
+        self.f.seek(0)
+        self.f.write(header + "c" + " " * (HEADER_SIZE - len(header) - 2) + "\n")
+        self.f.seek(0, os.SEEK_END)
+        self.f.flush()
+
+
+def read_dimacs(f):
+    """
+    reads the clauses of a DIMACS CNF file one at a time
+    :param f: file object opened for reading text
+    :return: generator of clauses as lists of ints
+    """
+    clause = []
+    for line in f:
+        line = line.strip()
+        if not line or line[0] in "cp%":
+            continue
+        for elem in line.split():
+            literal = int(elem)
+            if literal == 0:
+                yield clause
+                clause = []
+            else:
+                clause.append(literal)
+    if clause:
+        yield clause
+
+
+def parse_model(output: str):
+    """
+    parses the output of a solver that follows the SAT competition format, "s" lines hold the status and "v" lines
+    hold the model
+    :param output: standard output of the solver
+    :return: list with the signed literals of the model, None if the formula is unsatisfiable
+    """
+    status = None
+    model = []
+    for line in output.splitlines():
+        if line.startswith("s "):
+            status = line[2:].strip()
+        elif line.startswith("v "):
+            model.extend(int(elem) for elem in line[2:].split() if elem != "0")
+    if status == "SATISFIABLE":
+        return model
+    elif status == "UNSATISFIABLE":
+        return None
+    else:
+        raise Exception("Solver did not report a result")
+
+
+def solve_external(encode, solver: str, timeout: float = None):
+    """
+    solves a formula with an external solver binary, the formula is streamed to a temporary DIMACS file which is handed
+    to the solver and removed afterwards
+    :param encode: function that takes a DimacsWriter and appends every clause of the formula to it
+    :param solver: path to the solver binary, such as kissat or cadical
+    :param timeout: seconds the solver may run before it is killed, None to wait until it finishes
+    :return: list with the signed literals of the model, None if the formula is unsatisfiable
+    """
+    fd, filename = tempfile.mkstemp(suffix=".cnf")
+    try:
+        with os.fdopen(fd, "w") as f:
+            writer = DimacsWriter(f)
+            encode(writer)
+            writer.close()
+        try:
+            result = subprocess.run([solver, filename], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                    universal_newlines=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            raise Exception("External solver timed out")
+    finally:
+        os.remove(filename)
+
+    # solvers exit with 10 when the formula is satisfiable and 20 when it is not
+    if result.returncode not in (10, 20):
+        raise Exception("External solver failed with exit code " + str(result.returncode))
+    return parse_model(result.stdout)
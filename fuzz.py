@@ -0,0 +1,173 @@
+import argparse
+import random
+import time
+from matrix import Game
+from matrix import Type
+from matrix import Pipe
+from main import heuristic_hint
+from main import solve_sat_game
+from verify import verify_path
+from verify import verify_solution
+
+# rectangular boards cycled through by fuzz when asked to, including corridors only a couple of cells wide
+SHAPES = ((2, 15), (15, 2), (3, 8), (8, 3), (4, 12), (12, 4), (2, 5), (6, 9))
+
+
+def random_game(size: int, rng: random.Random, cols: int = None):
+    """
+    generates a random game in memory
+    :param size: size of the game board, the number of rows when cols is given
+    :param rng: random number generator used to pick the pipes
+    :param cols: number of columns of the game board, the board is square when None
+    :return: game object with random turn and straight pipes
+    """
+    cols = size if cols is None else cols
+    return Game([[Pipe(Type(rng.randint(1, 2)), col, row) for col in range(cols)] for row in range(size)])
+
+
+def run_algorithm(game: Game):
+    """
+    solves the game via recursion and checks the returned path
+    :param game: game to be solved
+    :return: tuple with whether a solution was claimed and whether it was verified
+    """
+    path = game.get_winning_path()
+    return bool(path), verify_path(game, path) if path else False
+
+
+def run_frontier(game: Game):
+    """
+    checks the game via the frontier search and checks the recovered path, a route that passes a cell twice proves
+    nothing either way
+    :param game: game to be solved
+    :return: tuple with whether a solution was claimed and whether it was verified, None if it can't be verified
+    """
+    if not game.is_solvable():
+        return False, False
+    path = game.get_frontier_path()
+    return True, verify_path(game, path) if path else None
+
+
+def run_sat(game: Game):
+    """
+    solves the game via sat reduction and checks the returned model
+    :param game: game to be solved
+    :return: tuple with whether a solution was claimed and whether it was verified
+    """
+    result = solve_sat_game(game)
+    return result.solved, verify_solution(game, result.solution) if result.solved else False
+
+
+ENGINES = {
+    "algorithm": run_algorithm,
+    "frontier": run_frontier,
+    "sat": run_sat,
+}
+
+
+def fuzz(seed: int = 0, boards: int = 1000, sizes=(2, 3, 4, 5, 8, 10, 15), engines=None, shapes=None):
+    """
+    generates random boards, solves every board with every engine and cross checks the results. A disagreement is
+    reported whenever an engine claims a solution that does not verify or when a verified solution exists but another
+    engine did not find one
+    :param seed: seed for the board generator, the same seed always produces the same boards
+    :param boards: number of boards to generate
+    :param sizes: board sizes to cycle through
+    :param engines: names of the engines to run, defaults to all of them
+    :param shapes: (rows, cols) pairs to cycle through instead of the square sizes, such as SHAPES
+    :return: tuple with the list of disagreements and a dictionary of timings per engine and (rows, cols)
+    """
+    rng = random.Random(seed)
+    engines = list(ENGINES) if engines is None else engines
+    shapes = [(size, size) for size in sizes] if shapes is None else shapes
+    disagreements = []
+    timings = {name: {} for name in engines}
+    for ii in range(boards):
+        shape = tuple(shapes[ii % len(shapes)])
+        game = random_game(shape[0], rng, shape[1])
+        results = {}
+        for name in engines:
+            start = time.perf_counter()
+            claimed, valid = ENGINES[name](game)
+            timings[name].setdefault(shape, []).append(time.perf_counter() - start)
+            results[name] = (claimed, valid)
+
+        solvable = any(valid for _, valid in results.values())
+        for name, (claimed, valid) in results.items():
+            if claimed and valid is False:
+                disagreements.append((ii, shape, name, "claimed solution does not verify", game))
+            elif solvable and not claimed:
+                disagreements.append((ii, shape, name, "missed a verified solution", game))
+    return disagreements, timings
+
+
+def compare_warm_start(seed: int = 0, boards: int = 100, sizes=(10, 20, 40, 60)):
+    """
+    solves random boards via sat reduction from a cold start, with the frontier path as preferred polarities and with
+    the frontier path also assumed, and adds up the solver statistics of every mode
+    :param seed: seed for the board generator
+    :param boards: number of boards to generate
+    :param sizes: board sizes to cycle through
+    :return: dictionary with the total conflicts, decisions and seconds of every mode
+    """
+    rng = random.Random(seed)
+    modes = {"cold": {}, "phases": {"hint": True}, "assumptions": {"hint": True, "assume": True}}
+    totals = dict((name, {"conflicts": 0, "decisions": 0, "seconds": 0.0, "mismatches": 0}) for name in modes)
+    for ii in range(boards):
+        game = random_game(sizes[ii % len(sizes)], rng)
+        start = time.perf_counter()
+        hint = heuristic_hint(game)
+        hint_seconds = time.perf_counter() - start
+        verdict = None
+        for name, options in modes.items():
+            result = solve_sat_game(game, hint=hint if options.get("hint") else None, assume=options.get("assume"))
+            totals[name]["conflicts"] += result.solver_stats.get("conflicts", 0)
+            totals[name]["decisions"] += result.solver_stats.get("decisions", 0)
+            totals[name]["seconds"] += result.timings["solve"] + (hint_seconds if options.get("hint") else 0)
+            verdict = result.solved if verdict is None else verdict
+            totals[name]["mismatches"] += result.solved != verdict
+    return totals
+
+
+def report(disagreements, timings):
+    """
+    converts the results of a fuzz run to string
+    :param disagreements: disagreements returned by fuzz
+    :param timings: timings returned by fuzz
+    :return: string with the disagreements and the mean and max time of every engine per shape, rows first
+    """
+    final_str = ""
+    for ii, (rows, cols), name, reason, game in disagreements:
+        final_str += "board " + str(ii) + " (" + str(rows) + "x" + str(cols) + ") " + name + ": " + reason + "\n"
+        final_str += game.to_string()
+    final_str += str(len(disagreements)) + " disagreements\n"
+    for name, per_shape in timings.items():
+        for (rows, cols), times in sorted(per_shape.items()):
+            final_str += "%s %dx%d mean %.6f max %.6f\n" % (name, rows, cols, sum(times) / len(times), max(times))
+    return final_str
+
+
+def main():
+    parser = argparse.ArgumentParser(description="cross checks the solvers on random boards")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--boards", type=int, default=1000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2, 3, 4, 5, 8, 10, 15])
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=None)
+    parser.add_argument("--shapes", nargs="*", default=None, metavar="ROWSxCOLS",
+                        help="cycle through rectangular boards instead of the square sizes, the built in corridors and "
+                             "rectangles when no shape is given")
+    parser.add_argument("--warm-start", action="store_true", help="compare warm and cold sat solving instead")
+    args = parser.parse_args()
+    if args.warm_start:
+        for name, total in compare_warm_start(args.seed, args.boards, args.sizes).items():
+            print("%s conflicts %d decisions %d seconds %.4f verdict mismatches %d" %
+                  (name, total["conflicts"], total["decisions"], total["seconds"], total["mismatches"]))
+    else:
+        shapes = args.shapes
+        if shapes is not None:
+            shapes = [tuple(int(elem) for elem in shape.lower().split("x")) for shape in shapes] or SHAPES
+        print(report(*fuzz(args.seed, args.boards, args.sizes, args.engines, shapes)))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,17 +1,32 @@
 import csv
+import io
 import math
 import random
+import secrets
+from array import array
+from enum import Enum
 from matrix import Game
 from matrix import Type
 from matrix import Pipe
+import os
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
 from os import path
 import sys
 import time
 from pysat.solvers import Glucose4
+from dimacs import DimacsWriter
+from dimacs import solve_external
+from store import ResultStore
+from store import fingerprint
 
 sys.setrecursionlimit(10000)
-clauses = []
-visited = []
+
+# frames left for the callers of the recursive search when deciding whether a board is small enough for it
+RECURSION_MARGIN = 100
+
+# bytes of DIMACS lines copied from the shared memory of a worker to the file at a time
+BAND_CHUNK_SIZE = 1 << 20
 
 
 def get_matrix(filename):
@@ -41,59 +56,53 @@ def get_matrix(filename):
         if not (num_rows > ycord >= 0):
             raise Exception("Invalid y coordinate")
 
-    game_matrix = []
-    for row in range(num_cols):
-        tmp_row = []
-        for col in range(num_rows):
-            pipe_type = Type.EMPTY
-            for entry in parsed_game:
-                if entry[0] == col and entry[1] == row:
-                    pipe_type = Type(entry[2])
-
-            tmp_row.append(Pipe(pipe_type, col, row))
-
-        game_matrix.append(tmp_row)
+    game_matrix = [[Pipe(Type.EMPTY, col, row) for col in range(num_cols)] for row in range(num_rows)]
+    for entry in parsed_game:
+        game_matrix[entry[1]][entry[0]] = Pipe(Type(entry[2]), entry[0], entry[1])
     return Game(game_matrix)
 
 
-def gen_random_game_helper(size: int, filename: str = "game_gen.txt"):
+def gen_random_game_helper(size: int, filename: str = "game_gen.txt", cols: int = None):
     """
     generates a random game and saves to a file
-    :param size: size of the game board
+    :param size: size of the game board, the number of rows when cols is given
     :param filename: name of the file to be saved to
+    :param cols: number of columns of the game board, the board is square when None
     """
-    tmp_str = str(size) + ", " + str(size) + "\n"
-    for ii in range(size):
+    cols = size if cols is None else cols
+    tmp_str = str(size) + ", " + str(cols) + "\n"
+    for ii in range(cols):
         for jj in range(size):
             tmp_str += str(ii) + ", " + str(jj) + ", " + str(random.randint(1, 2)) + "\n"
     with open(filename, "w") as f:
         f.write(tmp_str)
 
 
-def gen_random_game(dimension=5, filename="game_gen.txt"):
+def gen_random_game(dimension=5, filename="game_gen.txt", cols=None):
     """
     method starts game
+    :param dimension: size of the game board, the number of rows when cols is given
     :param filename: file to be generated
+    :param cols: number of columns of the game board, the board is square when None
     """
     while True:
-        gen_random_game_helper(dimension, filename)
+        gen_random_game_helper(dimension, filename, cols)
         game = get_matrix(filename)
-        winning_path = game.get_winning_path()
+        # the frontier check is much cheaper than the search and rules out most boards that can't be won
+        if not game.is_solvable():
+            continue
+        # the frontier path is found without recursion, so long corridors work as well. When its route passes a cell
+        # twice the recursive search decides, as long as it can recurse once for every cell of the board
+        winning_path = game.get_frontier_path()
+        if winning_path is None and game.row * game.col + RECURSION_MARGIN < sys.getrecursionlimit():
+            winning_path = game.get_winning_path()
         if winning_path:
             break
     return game
 
 
-def solve_algorithm(dimension=5, filename="game_gen.txt"):
-    game = get_matrix(filename)
-    winning_path = game.get_winning_path()
-    game.generate_path(winning_path)
-    print(game.to_string())
-
-
-# gets the index with the correct number of padded 0's
-def get_index(dim, ii):
-    cells = dim * dim
+# gets the index with the correct number of padded 0's for a board with the given number of cells
+def get_index(cells, ii):
     ii = str(ii)
     return "1" + ii.zfill(len(str(cells)))
 
@@ -112,6 +121,65 @@ def get_coordinates(dim, i):
     return x_val, y_val
 
 
+def encode_rotation(pipe_type, orientation):
+    """
+    converts the orientation used by the pipe class into the rotation encoded in a sat literal
+    :param pipe_type: type of the pipe in the cell
+    :param orientation: orientation of the pipe
+    :return: last digit of the literal, ═:1 ║:2 ╔:3 ╗:4 ╝:5 ╚:6
+    """
+    # ═:1 ║:2 ╔:3 ╗:4 ╝:5 ╚:6
+    if pipe_type == Type.TURN:
+        return [6, 3, 4, 5][orientation]
+    elif pipe_type == Type.STRAIGHT:
+        return [2, 1][orientation]
+    else:
+        raise Exception("Invalid pipe")
+
+
+def decode_rotation(pipe_type, rot):
+    """
+    converts the rotation encoded in a sat literal into the orientation used by the pipe class
+    :param pipe_type: type of the pipe in the cell
+    :param rot: last digit of the literal, ═:1 ║:2 ╔:3 ╗:4 ╝:5 ╚:6
+    :return: orientation of the pipe
+    """
+    if pipe_type == Type.TURN:
+        if rot == 3:
+            return 1
+        elif rot == 4:
+            return 2
+        elif rot == 5:
+            return 3
+        elif rot == 6:
+            return 0
+        else:
+            raise Exception("turn pipe invalid orientation")
+    elif pipe_type == Type.STRAIGHT:
+        if rot == 1:
+            return 1
+        elif rot == 2:
+            return 0
+        else:
+            raise Exception("straight pipe invalid orientation")
+
+
+def apply_solution(game, solution):
+    """
+    turns every pipe of the board to the orientation chosen by the sat solver
+    :param game: game the solution was found for
+    :param solution: positive literals of the model, one per cell, in the order of the cells
+    """
+    matrix = game.get_matrix()
+    for ii, elem in enumerate(solution):
+        x, y = get_coordinates(game.col, ii)
+        pipe = matrix[y][x]
+        # ═:1 ║:2 ╔:3 ╗:4 ╝:5 ╚:6
+        orientation = decode_rotation(pipe.type, elem % 10)
+        if orientation is not None:
+            pipe.change_orientation(orientation)
+
+
 def parse_solution(game, solution):
     """
     generates path in grid from solution returned from the sat solver
@@ -124,48 +192,132 @@ def parse_solution(game, solution):
     -------
 
     """
-    matrix = game.get_matrix()
-    for ii, elem in enumerate(solution):
-        x, y = get_coordinates(game.col, ii)
-        pipe = matrix[y][x]
-        rot = int(str(elem)[-1])
-        # ═:1 ║:2 ╔:3 ╗:4 ╝:5 ╚:6
-        if pipe.type == Type.TURN:
-            if rot == 3:
-                pipe.change_orientation(1)
-            elif rot == 4:
-                pipe.change_orientation(2)
-            elif rot == 5:
-                pipe.change_orientation(3)
-            elif rot == 6:
-                pipe.change_orientation(0)
-            else:
-                raise Exception("turn pipe invalid orientation")
-        elif pipe.type == Type.STRAIGHT:
-            if rot == 1:
-                pipe.change_orientation(1)
-            elif rot == 2:
-                pipe.change_orientation(0)
-            else:
-                raise Exception("straight pipe invalid orientation")
+    apply_solution(game, solution)
     print(game.to_string())
 
 
-def sat_helper(game, ii, entry):
+class Status(Enum):
+    """
+    Enum class that represents the outcome of solving a game, either solved, unsolvable or inconclusive when the engine
+    could neither find a path nor rule one out.
+    """
+    SOLVED = 1
+    UNSOLVABLE = 2
+    INCONCLUSIVE = 3
+
+
+class SolveResult:
+    """
+    SolveResult holds the outcome of solving a game. The model of the sat solver is kept as a compact int array, the
+    path and the rendered board are only decoded from it when they are asked for so callers that only need the verdict
+    don't pay for decoding the board.
+    """
+
+    def __init__(self, game, status: Status, engine: str, model=None, path: list = None, timings: dict = None,
+                 num_clauses: int = 0, num_vars: int = 0, solver_stats: dict = None):
+        """
+        Constructor for the SolveResult class
+        :param game: game that was solved
+        :param status: whether the game was solved
+        :param engine: name of the engine that solved the game
+        :param model: signed literals of the sat model, the literal of variable v at position v - 1
+        :param path: list of (x, y, orientation) from source to destination, decoded from the model when None
+        :param timings: seconds spent in every stage of solving
+        :param num_clauses: number of clauses of the sat encoding
+        :param num_vars: number of variables of the sat encoding
+        :param solver_stats: conflicts, decisions, propagations and restarts reported by the sat solver
+        """
+        self.game = game
+        self.status = status
+        self.engine = engine
+        self.model = None if model is None else array("i" if len(model) < 2 ** 31 else "q", model)
+        self.timings = timings if timings is not None else {}
+        self.num_clauses = num_clauses
+        self.num_vars = num_vars
+        self.solver_stats = solver_stats if solver_stats is not None else {}
+        self.__path = path
+        # without a model there is nothing to decode the path from
+        self.__decoded = path is not None or model is None or status != Status.SOLVED
+
+    @property
+    def solved(self):
+        """
+        :return: true if the game was solved else false
+        """
+        return self.status == Status.SOLVED
+
+    @property
+    def path(self):
+        """
+        decodes the path from the model the first time it is asked for, only the cells the water flows through are
+        looked at
+        :return: list of (x, y, orientation) from source to destination, empty if the game was not solved, None if the
+        model does not connect source and destination or if the game was solved without a model or a known path
+        """
+        if not self.__decoded:
+            self.__decoded = True
+            dimension = self.game.col
+            cells = self.game.row * self.game.col
+            matrix = self.game.get_matrix()
+
+            def orientation_of(x, y):
+                ii_index = get_index(cells, get_int_index(dimension, x, y))
+                # ═:1 ║:2 ╔:3 ╗:4 ╝:5 ╚:6
+                for rot in range(1, 7):
+                    var = int(ii_index + str(rot))
+                    if var <= len(self.model) and self.model[var - 1] > 0:
+                        return decode_rotation(matrix[y][x].type, rot)
+                return None
+
+            route = self.game.walk_route(orientation_of)
+            self.__path = None if route is None else [tuple(step) for step in route]
+        return self.__path if self.__path is not None or self.solved else []
+
+    @property
+    def solution(self):
+        """
+        :return: positive literals of the model, one per cell, in the order expected by parse_solution
+        """
+        return None if self.model is None or not self.solved else model_to_solution(self.game, self.model)
+
+    def get_pipes(self):
+        """
+        :return: list of pipes of the winning path, empty if there is none
+        """
+        matrix = self.game.get_matrix()
+        return [Pipe(matrix[y][x].type, x, y, orientation) for x, y, orientation in self.path or []]
+
+    def render(self):
+        """
+        turns the pipes of the board to the solution and colors the winning path
+        :return: string of the solved game board
+        """
+        if self.solved and self.model is not None:
+            apply_solution(self.game, self.solution)
+        self.game.generate_path(self.get_pipes())
+        return self.game.to_string()
+
+
+def sat_helper(game, ii, entry, sink):
+    """
+    creates the constraints between the pipe in a cell and the pipes next to it
+    :param game: game being encoded
+    :param ii: integer index of the cell
+    :param entry: side the cell is entered from, 0 top, 1 right, 2 bottom, 3 left
+    :param sink: object with an append method that receives every clause
+    :return: list of [index, entry] for the cells to be encoded next, in the order they are to be visited
+    """
     dimension = game.col
-    cells = dimension * dimension
+    cells = game.row * game.col
     matrix = game.get_matrix()
     x, y = get_coordinates(dimension, ii)
     acc = []
-    if ii in visited:
-        return
-    visited.append(ii)
 
     # skip the source and destination to avoid creating unnecessary constraints
     # if (x == 0 and y == 0) or (ii == cells - 1):
     #   continue
 
-    ii_index = get_index(dimension, ii)
+    ii_index = get_index(cells, ii)
 
     if matrix[y][x].type == Type.STRAIGHT:
         # check for surrounding cells and create clauses for each situation
@@ -175,13 +327,12 @@ def sat_helper(game, ii, entry):
         if ii == 0:
             if game.valid_coord(x, y + 1):
                 ii_bottom = get_int_index(dimension, x, y + 1)
-                ii_string_bottom = get_index(dimension, ii_bottom)
+                ii_string_bottom = get_index(cells, ii_bottom)
                 pipe_bottom = matrix[y + 1][x]
-                sat_helper(game, ii_bottom, 0)
                 if pipe_bottom.type == Type.TURN:
-                    clauses.append([int(ii_string_bottom + "6"), int("-" + ii_index + "2")])
+                    sink.append([int(ii_string_bottom + "6"), int("-" + ii_index + "2")])
                 elif pipe_bottom.type == Type.STRAIGHT:
-                    clauses.append([int(ii_string_bottom + "2"), int("-" + ii_index + "2")])
+                    sink.append([int(ii_string_bottom + "2"), int("-" + ii_index + "2")])
                 return [[ii_bottom, 0]]
 
         # last cell
@@ -193,8 +344,8 @@ def sat_helper(game, ii, entry):
         if (entry == 0 or entry == 2) and game.valid_coord(x, y - 1) and game.valid_coord(x, y + 1):
             ii_top = get_int_index(dimension, x, y - 1)
             ii_bottom = get_int_index(dimension, x, y - 1)
-            ii_string_top = get_index(dimension, ii_top)
-            ii_string_bottom = get_index(dimension, ii_bottom)
+            ii_string_top = get_index(cells, ii_top)
+            ii_string_bottom = get_index(cells, ii_bottom)
 
             pipe_top = matrix[y - 1][x]
             pipe_bottom = matrix[y + 1][x]
@@ -202,24 +353,22 @@ def sat_helper(game, ii, entry):
             # ═:1 ║:2 ╔:3 ╗:4 ╝:5 ╚:6
 
             if entry == 2:
-                sat_helper(game, ii_top, 2)
                 acc.append([ii_top, 2])
                 if pipe_top.type == Type.TURN:
-                    clauses.append([int(ii_string_top + "4"), int(ii_string_top + "3"), int("-" + ii_index + "2")])
+                    sink.append([int(ii_string_top + "4"), int(ii_string_top + "3"), int("-" + ii_index + "2")])
                 # curr2 -> (top3
                 elif pipe_top.type == Type.STRAIGHT:
-                    clauses.append([int(ii_string_top + "2"), int("-" + ii_index + "2")])
+                    sink.append([int(ii_string_top + "2"), int("-" + ii_index + "2")])
                 else:
                     raise Exception("unexpected pipe")
 
             if entry == 0:
-                sat_helper(game, ii_bottom, 0)
                 acc.append([ii_bottom, 0])
                 if pipe_bottom.type == Type.TURN:
-                    clauses.append(
+                    sink.append(
                         [int(ii_string_bottom + "5"), int(ii_string_bottom + "6"), int("-" + ii_index + "2")])
                 elif pipe_bottom.type == Type.STRAIGHT:
-                    clauses.append([int(ii_string_bottom + "2"), int("-" + ii_index + "2")])
+                    sink.append([int(ii_string_bottom + "2"), int("-" + ii_index + "2")])
                 else:
                     raise Exception("unexpected pipe")
         else:
@@ -230,8 +379,8 @@ def sat_helper(game, ii, entry):
         if (entry == 1 or entry == 3) and game.valid_coord(x + 1, y) and game.valid_coord(x - 1, y):
             ii_right = get_int_index(dimension, x + 1, y)
             ii_left = get_int_index(dimension, x - 1, y)
-            ii_string_right = get_index(dimension, ii_right)
-            ii_string_left = get_index(dimension, ii_left)
+            ii_string_right = get_index(cells, ii_right)
+            ii_string_left = get_index(cells, ii_left)
 
             pipe_left = matrix[y][x - 1]
             pipe_right = matrix[y][x + 1]
@@ -239,39 +388,37 @@ def sat_helper(game, ii, entry):
             # ═:1 ║:2 ╔:3 ╗:4 ╝:5 ╚:6
 
             if entry == 3:
-                sat_helper(game, ii_right, 3)
                 acc.append([ii_right, 3])
                 if pipe_right.type == Type.TURN:
                     if game.valid_coord(x + 1, y - 1) and game.valid_coord(x + 1, y + 1):
-                        clauses.append(
+                        sink.append(
                             [int(ii_string_right + "4"), int(ii_string_right + "5"), int("-" + ii_index + "1")])
                     elif game.valid_coord(x + 1, y - 1):
-                        clauses.append(
+                        sink.append(
                             [int(ii_string_right + "5"), int("-" + ii_index + "1")])
                     elif game.valid_coord(x + 1, y + 1):
-                        clauses.append(
+                        sink.append(
                             [int(ii_string_right + "4"), int("-" + ii_index + "1")])
 
 
                 elif pipe_right.type == Type.STRAIGHT:
-                    clauses.append([int(ii_string_right + "1"), int("-" + ii_index + "1")])
+                    sink.append([int(ii_string_right + "1"), int("-" + ii_index + "1")])
                 else:
                     raise Exception("unexpected pipe")
 
             if entry == 1:
-                sat_helper(game, ii_left, 1)
                 acc.append([ii_left, 1])
                 if pipe_left.type == Type.TURN:
-                    clauses.append(
+                    sink.append(
                         [int(ii_string_left + "3"), int(ii_string_left + "6"), int("-" + ii_index + "1")])
                 elif pipe_left.type == Type.STRAIGHT:
-                    clauses.append([int(ii_string_left + "1"), int("-" + ii_index + "1")])
+                    sink.append([int(ii_string_left + "1"), int("-" + ii_index + "1")])
                 else:
                     raise Exception("unexpected pipe")
         else:
             pass  # TODO
             # if not ((x == 0 and y == 0) or (ii == cells - 1)):
-            # clauses.append([int("-"+ii_index+"1")])
+            # sink.append([int("-"+ii_index+"1")])
 
     elif matrix[y][x].type == Type.TURN:
         # check for surrounding cells and create clauses for each situation
@@ -280,55 +427,52 @@ def sat_helper(game, ii, entry):
         if ii == 0:
             if game.valid_coord(x + 1, y):
                 ii_right = get_int_index(dimension, x + 1, y)
-                ii_string_right = get_index(dimension, ii_right)
+                ii_string_right = get_index(cells, ii_right)
                 pipe_right = matrix[y][x + 1]
-                sat_helper(game, ii_right, 3)
                 if pipe_right.type == Type.TURN:
-                    clauses.append([int(ii_string_right + "4"), int("-" + ii_index + "6")])
+                    sink.append([int(ii_string_right + "4"), int("-" + ii_index + "6")])
                 elif pipe_right.type == Type.STRAIGHT:
-                    clauses.append([int(ii_string_right + "1"), int("-" + ii_index + "6")])
+                    sink.append([int(ii_string_right + "1"), int("-" + ii_index + "6")])
                 return [[ii_right, 3]]
 
         # last cell
         if ii == cells - 1:
             if game.valid_coord(x, y - 1):
                 ii_top = get_int_index(dimension, x, y - 1)
-                ii_string_top = get_index(dimension, ii_top)
+                ii_string_top = get_index(cells, ii_top)
                 pipe_top = matrix[y - 1][x]
                 if pipe_top.type == Type.TURN:
-                    clauses.append([int(ii_string_top + "4"), int("-" + ii_index + "6")])
+                    sink.append([int(ii_string_top + "4"), int("-" + ii_index + "6")])
                 elif pipe_top.type == Type.STRAIGHT:
-                    clauses.append([int(ii_string_top + "2"), int("-" + ii_index + "6")])
+                    sink.append([int(ii_string_top + "2"), int("-" + ii_index + "6")])
                     pass
-                return [[ii_top, 2]]
+                return []
 
         # ═:1 ║:2 ╔:3 ╗:4 ╝:5 ╚:6
         # left cell/top cell
         if (entry == 0 or entry == 3) and game.valid_coord(x, y - 1) and game.valid_coord(x - 1, y):
             ii_top = get_int_index(dimension, x, y - 1)
             ii_left = get_int_index(dimension, x - 1, y)
-            ii_string_top = get_index(dimension, ii_top)
-            ii_string_left = get_index(dimension, ii_left)
+            ii_string_top = get_index(cells, ii_top)
+            ii_string_left = get_index(cells, ii_left)
 
             pipe_left = matrix[y][x - 1]
             pipe_top = matrix[y - 1][x]
             if entry == 3:
-                sat_helper(game, ii_top, 2)
                 acc.append([ii_top, 2])
                 if pipe_top.type == Type.STRAIGHT:
-                    clauses.append([int(ii_string_top + "2"), int("-" + ii_index + "5")])
+                    sink.append([int(ii_string_top + "2"), int("-" + ii_index + "5")])
                 elif pipe_top.type == Type.TURN:
-                    clauses.append([int(ii_string_top + "3"), int(ii_string_top + "4"), int("-" + ii_index + "5")])
+                    sink.append([int(ii_string_top + "3"), int(ii_string_top + "4"), int("-" + ii_index + "5")])
                 else:
                     raise Exception("invalid pipe")
 
             if entry == 0:
-                sat_helper(game, ii_left, 1)
                 acc.append([ii_left, 1])
                 if pipe_left.type == Type.STRAIGHT:
-                    clauses.append([int(ii_string_left + "1"), int("-" + ii_index + "5")])
+                    sink.append([int(ii_string_left + "1"), int("-" + ii_index + "5")])
                 elif pipe_left.type == Type.TURN:
-                    clauses.append([int(ii_string_left + "6"), int(ii_string_left + "3"), int("-" + ii_index + "5")])
+                    sink.append([int(ii_string_left + "6"), int(ii_string_left + "3"), int("-" + ii_index + "5")])
                 else:
                     raise Exception("Invalid pipe")
 
@@ -339,29 +483,27 @@ def sat_helper(game, ii, entry):
         if (entry == 0 or entry == 1) and game.valid_coord(x + 1, y) and game.valid_coord(x, y - 1):
             ii_top = get_int_index(dimension, x, y - 1)
             ii_right = get_int_index(dimension, x + 1, y)
-            ii_string_top = get_index(dimension, ii_top)
-            ii_string_right = get_index(dimension, ii_right)
+            ii_string_top = get_index(cells, ii_top)
+            ii_string_right = get_index(cells, ii_right)
 
             pipe_top = matrix[y - 1][x]
             pipe_right = matrix[y][x + 1]
             # ═:1 ║:2 ╔:3 ╗:4 ╝:5 ╚:6
             if entry == 1:
-                sat_helper(game, ii_top, 2)
                 acc.append([ii_top, 2])
                 if pipe_top.type == Type.STRAIGHT:
-                    clauses.append([int(ii_string_top + "2"), int("-" + ii_index + "6")])
+                    sink.append([int(ii_string_top + "2"), int("-" + ii_index + "6")])
                 elif pipe_top.type == Type.TURN:
-                    clauses.append([int(ii_string_top + "3"), int(ii_string_top + "4"), int("-" + ii_index + "6")])
+                    sink.append([int(ii_string_top + "3"), int(ii_string_top + "4"), int("-" + ii_index + "6")])
                 else:
                     raise Exception("invalid pipe")
 
             if entry == 0:
-                sat_helper(game, ii_right, 3)
                 acc.append([ii_right, 3])
                 if pipe_right.type == Type.STRAIGHT:
-                    clauses.append([int(ii_string_right + "1"), int("-" + ii_index + "6")])
+                    sink.append([int(ii_string_right + "1"), int("-" + ii_index + "6")])
                 elif pipe_right.type == Type.TURN:
-                    clauses.append([int(ii_string_right + "4"), int(ii_string_right + "5"), int("-" + ii_index + "6")])
+                    sink.append([int(ii_string_right + "4"), int(ii_string_right + "5"), int("-" + ii_index + "6")])
                 else:
                     raise Exception("Invalid pipe")
 
@@ -372,32 +514,30 @@ def sat_helper(game, ii, entry):
         if (entry == 1 or entry == 2) and game.valid_coord(x, y + 1) and game.valid_coord(x + 1, y):
             ii_bottom = get_int_index(dimension, x, y + 1)
             ii_right = get_int_index(dimension, x + 1, y)
-            ii_string_bottom = get_index(dimension, ii_bottom)
-            ii_string_right = get_index(dimension, ii_right)
+            ii_string_bottom = get_index(cells, ii_bottom)
+            ii_string_right = get_index(cells, ii_right)
 
             pipe_bottom = matrix[y + 1][x]
             pipe_right = matrix[y][x + 1]
 
             if entry == 1:
                 # ═:1 ║:2 ╔:3 ╗:4 ╝:5 ╚:6
-                sat_helper(game, ii_bottom, 0)
                 acc.append([ii_bottom, 0])
                 if pipe_bottom.type == Type.STRAIGHT:
-                    clauses.append([int(ii_string_bottom + "2"), int("-" + ii_index + "3")])
+                    sink.append([int(ii_string_bottom + "2"), int("-" + ii_index + "3")])
                 elif pipe_bottom.type == Type.TURN:
-                    clauses.append(
+                    sink.append(
                         [int(ii_string_bottom + "6"), int(ii_string_bottom + "5"), int("-" + ii_index + "3")])
                 else:
                     raise Exception("invalid pipe")
 
             if entry == 2:
-                sat_helper(game, ii_right, 3)
                 acc.append([ii_right, 3])
                 if pipe_right.type == Type.STRAIGHT:
-                    clauses.append([int(ii_string_right + "1"), int("-" + ii_index + "3")])
+                    sink.append([int(ii_string_right + "1"), int("-" + ii_index + "3")])
                 elif pipe_right.type == Type.TURN:
 
-                    clauses.append([int(ii_string_right + "4"), int(ii_string_right + "5"), int("-" + ii_index + "3")])
+                    sink.append([int(ii_string_right + "4"), int(ii_string_right + "5"), int("-" + ii_index + "3")])
                 else:
                     raise Exception("Invalid pipe")
 
@@ -408,39 +548,37 @@ def sat_helper(game, ii, entry):
         if (entry == 3 or entry == 2) and game.valid_coord(x - 1, y) and game.valid_coord(x, y + 1):
             ii_bottom = get_int_index(dimension, x, y + 1)
             ii_left = get_int_index(dimension, x - 1, y)
-            ii_string_bottom = get_index(dimension, ii_bottom)
-            ii_string_left = get_index(dimension, ii_left)
+            ii_string_bottom = get_index(cells, ii_bottom)
+            ii_string_left = get_index(cells, ii_left)
 
             pipe_bottom = matrix[y + 1][x]
             pipe_left = matrix[y][x - 1]
 
             # ═:1 ║:2 ╔:3 ╗:4 ╝:5 ╚:6
             if entry == 3:
-                sat_helper(game, ii_bottom, 0)
                 acc.append([ii_bottom, 0])
                 if pipe_bottom.type == Type.STRAIGHT:
-                    clauses.append([int(ii_string_bottom + "2"), int("-" + ii_index + "4")])
+                    sink.append([int(ii_string_bottom + "2"), int("-" + ii_index + "4")])
                 elif pipe_bottom.type == Type.TURN:
                     if game.valid_coord(x + 1, y + 1) and game.valid_coord(x - 1, y + 1):
-                        clauses.append(
+                        sink.append(
                             [int(ii_string_bottom + "6"), int(ii_string_bottom + "5"), int("-" + ii_index + "4")])
                     elif game.valid_coord(x + 1, y + 1):
-                        clauses.append(
+                        sink.append(
                             [int(ii_string_bottom + "6"), int("-" + ii_index + "4")])
                     elif game.valid_coord(x - 1, y + 1):
-                        clauses.append(
+                        sink.append(
                             [int(ii_string_bottom + "5"), int("-" + ii_index + "4")])
 
                 else:
                     raise Exception("invalid pipe")
 
             if entry == 2:
-                sat_helper(game, ii_left, 1)
                 acc.append([ii_left, 1])
                 if pipe_left.type == Type.STRAIGHT:
-                    clauses.append([int(ii_string_left + "1"), int("-" + ii_index + "4")])
+                    sink.append([int(ii_string_left + "1"), int("-" + ii_index + "4")])
                 elif pipe_left.type == Type.TURN:
-                    clauses.append([int(ii_string_left + "6"), int(ii_string_left + "3"), int("-" + ii_index + "4")])
+                    sink.append([int(ii_string_left + "6"), int(ii_string_left + "3"), int("-" + ii_index + "4")])
                 else:
                     raise Exception("Invalid pipe")
         else:
@@ -452,13 +590,63 @@ def sat_helper(game, ii, entry):
     return acc
 
 
-def solve_sat(dimension=5, filename="test.txt"):
-    cells = dimension * dimension  # Represents the number of cells in the grid
-    # gen_random_game(dimension, filename)
-    game = get_matrix(filename)
+def encode_adjacency(game, sink):
+    """
+    walks the board from the source and creates the constraints between adjacent pipes, the walk uses an explicit
+    stack and visits the cells in the same depth first order as a recursive walk would
+    :param game: game being encoded
+    :param sink: object with an append method that receives every clause
+    :return: bytearray with one plus the side every visited cell was entered from, 0 for cells never visited
+    """
+    visited = bytearray(game.row * game.col)
+    stack = [[0, 0]]
+    while stack:
+        ii, entry = stack.pop()
+        if visited[ii]:
+            continue
+        visited[ii] = entry + 1
+        stack.extend(reversed(sat_helper(game, ii, entry, sink)))
+    return visited
+
+
+class SolverSink:
+    """
+    SolverSink adds clauses to a pysat solver as soon as they are created so the encoding never has to be held in a
+    python list, the clauses are counted for reporting.
+    """
 
-    # ensures that all coordinates in matrix are valid
-    for ii in range(cells):
+    def __init__(self, solver):
+        """
+        Constructor for the SolverSink class
+        :param solver: pysat solver the clauses are added to
+        """
+        self.solver = solver
+        self.num_clauses = 0
+
+    @property
+    def num_vars(self):
+        """
+        :return: largest variable added to the solver
+        """
+        return self.solver.nof_vars()
+
+    def append(self, clause: list):
+        """
+        adds a single clause to the solver
+        :param clause: list of non zero ints, negative ints are negated literals
+        """
+        self.solver.add_clause(clause)
+        self.num_clauses += 1
+
+
+
+def check_coordinates(game):
+    """
+    ensures that all coordinates in matrix are valid
+    :param game: game being encoded
+    """
+    dimension = game.col
+    for ii in range(game.row * game.col):
         x, y = get_coordinates(dimension, ii)
         if get_int_index(dimension, x, y) != ii:
             raise Exception("Get int index function failed")
@@ -466,64 +654,502 @@ def solve_sat(dimension=5, filename="test.txt"):
         if not game.valid_coord(x, y):
             raise Exception("Error with matrix creation")
 
+
+def encode_endpoints(game, sink):
+    """
+    creates the constraints for the source and destination pipes
+    :param game: game being encoded
+    :param sink: object with an append method that receives every clause
+    """
+    cells = game.row * game.col  # Represents the number of cells in the grid
     matrix = game.get_matrix()
 
     # create constraints for source pipe
     if matrix[0][0].type == Type.STRAIGHT:
-        start_index = get_index(dimension, 0)
-        clauses.append([int(start_index + "2")])
+        start_index = get_index(cells, 0)
+        sink.append([int(start_index + "2")])
     elif matrix[0][0].type == Type.TURN:
-        start_index = get_index(dimension, 0)
-        clauses.append([int(start_index + "6")])
+        start_index = get_index(cells, 0)
+        sink.append([int(start_index + "6")])
 
     # create constraints for destination pipe
-    if matrix[dimension - 1][dimension - 1].type == Type.STRAIGHT:
-        start_index = get_index(dimension, cells - 1)
-        clauses.append([int(start_index + "1")])
-    elif matrix[dimension - 1][dimension - 1].type == Type.TURN:
-        start_index = get_index(dimension, cells - 1)
-        clauses.append([int(start_index + "6")])
-
-    # create constraints to ensure that each cell has one pipe type either ═:1 ║:2 ╔:3 ╗:4 ╝:5 ╚:6
-    for ii in range(cells):
-        x, y = get_coordinates(dimension, ii)
-        ii_index = get_index(dimension, ii)
-
-        if matrix[y][x].type == Type.STRAIGHT:
-            # has to be one orientation either 1 or 2
-            clauses.append([int(ii_index + "1"), int(ii_index + "2")])
-            # can't be both orientations at same time, negation of 1 ^ 2 is -1 ∨ -2
-            clauses.append([int("-" + ii_index + "1"), int("-" + ii_index + "2")])
-        elif matrix[y][x].type == Type.TURN:
-            # has to be either 3, 4, 5, 6
-            clauses.append([int(ii_index + "3"), int(ii_index + "4"), int(ii_index + "5"), int(ii_index + "6")])
-            # can only be one
-        else:
-            raise Exception("Invalid Pipe when creating constraints")
+    if matrix[game.row - 1][game.col - 1].type == Type.STRAIGHT:
+        start_index = get_index(cells, cells - 1)
+        sink.append([int(start_index + "1")])
+    elif matrix[game.row - 1][game.col - 1].type == Type.TURN:
+        start_index = get_index(cells, cells - 1)
+        sink.append([int(start_index + "6")])
 
-        for jj in range(0, 7):
-            for kk in range(jj + 1, 7):
-                clauses.append([int("-" + ii_index + str(jj)), int("-" + ii_index + str(kk))])
+
+def encode_cell(game, ii, sink):
+    """
+    creates the constraints to ensure that a cell has one pipe type either ═:1 ║:2 ╔:3 ╗:4 ╝:5 ╚:6
+    :param game: game being encoded
+    :param ii: integer index of the cell
+    :param sink: object with an append method that receives every clause
+    """
+    x, y = get_coordinates(game.col, ii)
+    # the variable of each rotation is the index of the cell followed by the digit of the rotation
+    base = int(get_index(game.row * game.col, ii)) * 10
+    pipe_type = game.get_matrix()[y][x].type
+
+    if pipe_type == Type.STRAIGHT:
+        # has to be one orientation either 1 or 2
+        sink.append([base + 1, base + 2])
+        # can't be both orientations at same time, negation of 1 ^ 2 is -1 ∨ -2
+        sink.append([-(base + 1), -(base + 2)])
+    elif pipe_type == Type.TURN:
+        # has to be either 3, 4, 5, 6
+        sink.append([base + 3, base + 4, base + 5, base + 6])
+        # can only be one
+    else:
+        raise Exception("Invalid Pipe when creating constraints")
+
+    for jj in range(0, 7):
+        for kk in range(jj + 1, 7):
+            sink.append([-(base + jj), -(base + kk)])
+
+
+def encode_game(game, sink):
+    """
+    creates the sat constraints for the game, every clause is handed to the sink as soon as it is created
+    :param game: game to be encoded
+    :param sink: object with an append method that receives every clause as a list of ints, such as a list, a
+    SolverSink or a DimacsWriter
+    :return: the sink
+    """
+    check_coordinates(game)
+    encode_endpoints(game, sink)
+    for ii in range(game.row * game.col):
+        encode_cell(game, ii, sink)
 
     # define interactions between pipes in adjacent cells
-    sat_helper(game, 0, 0)
+    encode_adjacency(game, sink)
+
+    return sink
 
-    g = Glucose4()
-    [g.add_clause(elem) for elem in clauses]
 
-    g.solve()
+class CountingSink:
+    """
+    CountingSink only counts the clauses it receives, used to walk the board without keeping any constraint.
+    """
+
+    def __init__(self):
+        """
+        Constructor for the CountingSink class
+        """
+        self.num_clauses = 0
+
+    def append(self, clause: list):
+        """
+        counts a single clause
+        :param clause: list of non zero ints, negative ints are negated literals
+        """
+        self.num_clauses += 1
+
+
+class BandSink:
+    """
+    BandSink passes on only the clauses that lie entirely inside a band of cells, or only the ones that don't, to
+    another sink.
+    """
+
+    def __init__(self, cells: int, first_cell: int, last_cell: int, sink, inside: bool = True):
+        """
+        Constructor for the BandSink class
+        :param cells: number of cells of the board
+        :param first_cell: integer index of the first cell of the band
+        :param last_cell: integer index one past the last cell of the band
+        :param sink: object with an append method that receives the clauses that are kept
+        :param inside: whether to keep the clauses inside the band or the ones reaching out of it
+        """
+        # the variables of a cell are its index behind the leading 1 added by get_index followed by one digit, so the
+        # variables of the band form a single range
+        offset = 10 ** len(str(cells))
+        self.low = (offset + first_cell) * 10
+        self.high = (offset + last_cell) * 10
+        self.sink = sink
+        self.inside = inside
+
+    def append(self, clause: list):
+        """
+        passes on a single clause if it is on the requested side of the band
+        :param clause: list of non zero ints, negative ints are negated literals
+        """
+        inside = all(self.low <= abs(elem) < self.high for elem in clause)
+        if inside == self.inside:
+            self.sink.append(clause)
+
+
+def encode_band(args):
+    """
+    writes the constraints of the cells of a band of rows as DIMACS lines in a worker process, clauses reaching into
+    the rows of another band are left to the seam pass of encode_game_parallel. The lines are returned in shared memory
+    :param args: tuple with the names of the shared memory holding the type grid and the entry points of the walk,
+    the name of the shared memory to be created for the lines, the number of rows and columns of the board and the
+    first row and the row one past the last row of the band
+    :return: tuple with the number of bytes in the shared memory, the number of clauses and the largest variable
+    """
+    types_name, entries_name, out_name, rows, cols, first_row, last_row = args
+    types = SharedMemory(types_name)
+    entries = SharedMemory(entries_name)
+    buffer = io.BytesIO()
+    text = io.TextIOWrapper(buffer, encoding="ascii", newline="\n")
+    try:
+        # only the rows of the band and the rows around it are ever looked at
+        empty = [None] * cols
+        matrix = [[Pipe(Type(types.buf[y * cols + x]), x, y) for x in range(cols)]
+                  if first_row - 1 <= y <= last_row else empty for y in range(rows)]
+        game = Game(matrix)
+        writer = DimacsWriter(text, False)
+        # the constraints of a cell never leave the cell, only the ones between cells have to be checked
+        band = BandSink(rows * cols, first_row * cols, last_row * cols, writer)
+        for ii in range(first_row * cols, last_row * cols):
+            encode_cell(game, ii, writer)
+            if entries.buf[ii]:
+                sat_helper(game, ii, entries.buf[ii] - 1, band)
+        text.flush()
+    finally:
+        types.close()
+        entries.close()
+
+    data = buffer.getbuffer()
+    size = len(data)
+    out = SharedMemory(out_name, create=True, size=max(size, 1))
+    try:
+        out.buf[:size] = data
+    finally:
+        data.release()
+        out.close()
+    return size, writer.num_clauses, writer.num_vars
 
+
+def read_chunks(name, size):
+    """
+    reads the DIMACS lines a worker left in shared memory a chunk at a time and removes the memory afterwards
+    :param name: name of the shared memory
+    :param size: number of bytes the worker wrote
+    :return: generator of strings
+    """
+    out = SharedMemory(name)
     try:
-        solution = g.get_model()
-        pos_sol = []
-        for elem in solution:
-            if elem >= 0:
-                pos_sol.append(elem)
-        parse_solution(game, pos_sol)
-    except TypeError as e:
-        print("No solution found via sat")
+        for start in range(0, size, BAND_CHUNK_SIZE):
+            yield str(out.buf[start:min(start + BAND_CHUNK_SIZE, size)], "ascii")
+    finally:
+        out.close()
+        out.unlink()
 
-    return game
+
+def unlink_shared_memory(name):
+    """
+    removes a block of shared memory if it exists
+    :param name: name of the shared memory
+    """
+    try:
+        out = SharedMemory(name)
+    except FileNotFoundError:
+        return
+    out.close()
+    out.unlink()
+
+
+def encode_game_parallel(game, writer, workers=None):
+    """
+    writes the sat constraints for the game in DIMACS format using one worker process per band of rows. The walk from
+    the source that decides which adjacency constraints exist runs first, then every worker formats the lines of its
+    band into shared memory and this process only copies them to the file in band order. The clauses between bands
+    are added last, so the file always comes out the same
+    :param game: game to be encoded
+    :param writer: DimacsWriter the clauses are written to
+    :param workers: number of worker processes, one per cpu when None
+    :return: the writer
+    """
+    workers = workers or os.cpu_count()
+    rows, cols = game.row, game.col
+    check_coordinates(game)
+    encode_endpoints(game, writer)
+    entries = encode_adjacency(game, CountingSink())
+
+    bounds = [rows * ii // workers for ii in range(workers + 1)]
+    bands = [(first_row, last_row) for first_row, last_row in zip(bounds, bounds[1:]) if first_row < last_row]
+    # the names of the blocks the workers write to are picked here so they can be removed if any worker fails
+    prefix = "pipes_" + secrets.token_hex(6) + "_"
+    names = [prefix + str(ii) for ii in range(len(bands))]
+    types = SharedMemory(create=True, size=rows * cols)
+    shared_entries = SharedMemory(create=True, size=rows * cols)
+    try:
+        types.buf[:rows * cols] = game.get_type_grid()
+        shared_entries.buf[:rows * cols] = entries
+        with Pool(len(bands)) as pool:
+            results = pool.map(encode_band, [(types.name, shared_entries.name, name, rows, cols, first_row, last_row)
+                                             for name, (first_row, last_row) in zip(names, bands)])
+
+        for name, (size, num_clauses, num_vars) in zip(names, results):
+            writer.append_lines(read_chunks(name, size), num_clauses, num_vars)
+    finally:
+        types.close()
+        types.unlink()
+        shared_entries.close()
+        shared_entries.unlink()
+        for name in names:
+            unlink_shared_memory(name)
+
+    # clauses between the first or last row of a band and the band next to it
+    for first_row, last_row in bands:
+        seam = BandSink(rows * cols, first_row * cols, last_row * cols, writer, False)
+        for y in sorted(set([first_row, last_row - 1])):
+            for ii in range(y * cols, (y + 1) * cols):
+                if entries[ii]:
+                    sat_helper(game, ii, entries[ii] - 1, seam)
+    return writer
+
+
+def model_to_solution(game, model):
+    """
+    picks the literal of every cell out of a model, variables that do not encode an orientation are ignored so models
+    from external solvers, which may set unused variables to true, can be passed in as well
+    :param game: game the model was found for
+    :param model: list with the signed literals of the model
+    :return: list with the positive literals of the model, one per cell, in the order expected by parse_solution
+    """
+    cells = game.row * game.col
+    positive = set(elem for elem in model if elem > 0)
+    pos_sol = []
+    for ii in range(cells):
+        ii_index = get_index(cells, ii)
+        # ═:1 ║:2 ╔:3 ╗:4 ╝:5 ╚:6
+        literals = [int(ii_index + str(rot)) for rot in range(1, 7) if int(ii_index + str(rot)) in positive]
+        if len(literals) != 1:
+            raise Exception("Model does not assign exactly one orientation to cell " + str(ii))
+        pos_sol.append(literals[0])
+    return pos_sol
+
+
+def encode_with(game, sink, workers=None):
+    """
+    creates the sat constraints for the game in this process or in parallel bands of rows
+    :param game: game to be encoded
+    :param sink: object with an append method that receives every clause, has to be a DimacsWriter when workers is
+    given
+    :param workers: number of worker processes, the game is encoded in this process when None
+    :return: the sink
+    """
+    if workers is None:
+        return encode_game(game, sink)
+    return encode_game_parallel(game, sink, workers)
+
+
+def export_dimacs(game, filename, workers=None):
+    """
+    writes the sat constraints for the game to a file in DIMACS format
+    :param game: game to be encoded
+    :param filename: name of the file to be saved to
+    :param workers: number of processes encoding bands of rows in parallel, the game is encoded in this process when
+    None
+    :return: the DimacsWriter with the number of variables and clauses written
+    """
+    with open(filename, "w") as f:
+        writer = DimacsWriter(f)
+        encode_with(game, writer, workers)
+        writer.close()
+    return writer
+
+
+def hint_literals(game, hint):
+    """
+    converts a candidate path into the literals that select the orientation of each of its pipes
+    :param game: game the path is for
+    :param hint: list of (x, y, orientation) of the candidate path
+    :return: list of positive literals, one per cell of the path
+    """
+    cells = game.row * game.col
+    matrix = game.get_matrix()
+    return [int(get_index(cells, get_int_index(game.col, x, y)) + str(encode_rotation(matrix[y][x].type, o)))
+            for x, y, o in hint]
+
+
+def heuristic_hint(game, store=None):
+    """
+    finds a candidate path cheaply to warm start the sat solver, a path stored for the same board is preferred over
+    the shortest route of the frontier search
+    :param game: game to be solved
+    :param store: ResultStore with earlier results, ignored when None
+    :return: list of (x, y, orientation) of the candidate path, empty if none was found
+    """
+    if store is not None:
+        for engine in ("sat", "algorithm", "frontier"):
+            record = store.lookup(game, engine)
+            if record is not None and record["path"]:
+                return [(pipe.xcord, pipe.ycord, pipe.orientation) for pipe in record["path"]]
+    winning_path = game.get_frontier_path() or []
+    return [(pipe.xcord, pipe.ycord, pipe.orientation) for pipe in winning_path]
+
+
+def solve_sat_game(game, solver=None, timeout=None, hint=None, assume=False, workers=None):
+    """
+    solves the game via sat reduction, the board itself is left untouched
+    :param game: game to be solved
+    :param solver: path to an external DIMACS solver binary such as kissat or cadical, Glucose4 is used when None
+    :param timeout: seconds the external solver may run before giving up
+    :param hint: list of (x, y, orientation) of a candidate path, its orientations become the preferred polarities of
+    Glucose4, ignored by external solvers
+    :param assume: whether the orientations of the hint are also assumed, the assumptions are dropped and the game is
+    solved again if they lead to a conflict
+    :param workers: number of processes writing bands of rows of the DIMACS file for the external solver in parallel,
+    the game is encoded in this process when None. Glucose4 takes its clauses one at a time in this process, so
+    workers can only be used with an external solver
+    :return: SolveResult with the model, the size of the encoding and the time spent encoding and solving
+    """
+    if solver is not None:
+        writers = []
+
+        def encode(writer):
+            start = time.time()
+            writers.append(encode_with(game, writer, workers))
+            timings["encode"] = time.time() - start
+
+        timings = {}
+        start = time.time()
+        model = solve_external(encode, solver, timeout)
+        timings["solve"] = time.time() - start - timings["encode"]
+        if model is not None:
+            # external solvers may list the literals in any order
+            ordered = [-var for var in range(1, writers[0].num_vars + 1)]
+            for elem in model:
+                ordered[abs(elem) - 1] = elem
+            model = ordered
+        return SolveResult(game, Status.UNSOLVABLE if model is None else Status.SOLVED, "sat", model,
+                           timings=timings, num_clauses=writers[0].num_clauses, num_vars=writers[0].num_vars)
+
+    if workers is not None:
+        raise Exception("Parallel encoding needs an external solver")
+    start = time.time()
+    g = Glucose4()
+    sink = encode_game(game, SolverSink(g))
+    encoded = time.time()
+    literals = hint_literals(game, hint) if hint else []
+    if literals:
+        g.set_phases(literals)
+    if literals and assume:
+        solved = g.solve(assumptions=literals)
+        if not solved:
+            solved = g.solve()
+    else:
+        solved = g.solve()
+    model = g.get_model()
+    num_vars = sink.num_vars
+    solver_stats = g.accum_stats()
+    g.delete()
+    timings = {"encode": encoded - start, "solve": time.time() - encoded}
+    return SolveResult(game, Status.SOLVED if solved else Status.UNSOLVABLE, "sat", model if solved else None,
+                       timings=timings, num_clauses=sink.num_clauses, num_vars=num_vars, solver_stats=solver_stats)
+
+
+def solve_game(game, engine="algorithm"):
+    """
+    solves the game with the given engine
+    :param game: game to be solved
+    :param engine: one of algorithm, frontier or sat
+    :return: SolveResult of the engine, its path is None if the sat model does not connect source and destination. The
+    frontier engine falls back to the search when its route passes a cell twice and is inconclusive if that finds
+    nothing
+    """
+    if engine == "sat":
+        return solve_sat_game(game)
+
+    start = time.time()
+    if engine == "algorithm":
+        winning_path = (game.is_solvable() and game.get_winning_path()) or []
+    elif engine == "frontier":
+        winning_path = game.get_frontier_path()
+        if winning_path is None:
+            # a route that passes a cell twice proves nothing, the board may or may not be solvable
+            winning_path = game.get_winning_path()
+            if not winning_path:
+                return SolveResult(game, Status.INCONCLUSIVE, engine, path=[], timings={"solve": time.time() - start})
+    else:
+        raise Exception("Unknown engine")
+    path = [(pipe.xcord, pipe.ycord, pipe.orientation) for pipe in winning_path]
+    return SolveResult(game, Status.SOLVED if path else Status.UNSOLVABLE, engine, path=path,
+                       timings={"solve": time.time() - start})
+
+
+def record_to_result(game, engine, record):
+    """
+    converts a result found in the store to a SolveResult
+    :param game: game the result is for
+    :param engine: name of the engine that solved the game
+    :param record: dictionary returned by the store
+    :return: SolveResult with the stored status, path and time
+    """
+    path = [(pipe.xcord, pipe.ycord, pipe.orientation) for pipe in record["path"]]
+    return SolveResult(game, Status.SOLVED if record["solvable"] else Status.UNSOLVABLE, engine,
+                       path=path if path or not record["solvable"] else None, timings={"solve": record["seconds"]})
+
+
+def solve_batch(games, store=None, engine="algorithm"):
+    """
+    solves many games, games found in the store are not solved again and games repeated within the batch, including
+    mirror images of each other, are only solved once
+    :param games: list of games to be solved
+    :param store: ResultStore consulted before solving and updated afterwards, an in memory store is used when None
+    :param engine: one of algorithm, frontier or sat
+    :return: list with a SolveResult for every game, in the same order
+    """
+    if store is None:
+        store = ResultStore(":memory:")
+    # fingerprinting packs the whole board twice, so it is only done once per game
+    keys = [fingerprint(game) for game in games]
+    records = store.lookup_many(games, engine, keys)
+
+    pending = {}
+    for game, key, record in zip(games, keys, records):
+        if record is None:
+            pending.setdefault(key[0], (game, key))
+    results = {}
+    for game, key in pending.values():
+        results[key[0]] = solve_game(game, engine)
+    # inconclusive results are never stored so the board is solved again next time
+    store.insert_many([(result.game, engine, result.solved, result.get_pipes(), sum(result.timings.values()),
+                        pending[key][1]) for key, result in results.items() if result.status != Status.INCONCLUSIVE])
+
+    missing = [ii for ii, record in enumerate(records) if record is None]
+    found = store.lookup_many([games[ii] for ii in missing], engine, [keys[ii] for ii in missing])
+    for ii, record in zip(missing, found):
+        records[ii] = record
+    # games solved in this batch keep their full result, repeats get the result from the store or share the
+    # inconclusive status of the game they repeat
+    solved = dict((id(result.game), result) for result in results.values())
+    return [solved[id(game)] if id(game) in solved else record_to_result(game, engine, record) if record is not None
+            else SolveResult(game, Status.INCONCLUSIVE, engine, path=[], timings=results[key[0]].timings)
+            for game, key, record in zip(games, keys, records)]
+
+
+def solve_algorithm(dimension=5, filename="game_gen.txt", store=None):
+    game = get_matrix(filename)
+    return solve_batch([game], store, "algorithm")[0]
+
+
+def solve_sat(dimension=5, filename="test.txt", solver=None, timeout=None, store=None, warm_start=False, workers=None,
+              assume=False):
+    # gen_random_game(dimension, filename)
+    game = get_matrix(filename)
+
+    # stored results can only be used if the board can't be won or if the path is known
+    record = None if store is None else store.lookup(game, "sat")
+    if record is not None and (not record["solvable"] or record["path"]):
+        return record_to_result(game, "sat", record)
+
+    start = time.time()
+    hint = heuristic_hint(game, store) if warm_start else None
+    hinted = time.time()
+    # the orientations of the hint are only assumed when there is a hint, the assumptions are retracted on a conflict
+    result = solve_sat_game(game, solver, timeout, hint, assume, workers)
+    if warm_start:
+        result.timings["hint"] = hinted - start
+    if store is not None:
+        store.insert(game, "sat", result.solved, result.get_pipes(), sum(result.timings.values()))
+    return result
 
 
 def main():
@@ -542,9 +1168,13 @@ def main():
     print("original game board:")
     print(gen_random_game(dim, "test.txt").to_string())
     print("solution via algorithm:")
-    solve_algorithm(dim, "test.txt")
+    print(solve_algorithm(dim, "test.txt").render())
     print("solution via sat solver:")
-    solve_sat(dim, "test.txt")
+    result = solve_sat(dim, "test.txt")
+    if result.solved:
+        print(result.render())
+    else:
+        print("No solution found via sat")
 
 
 
@@ -11,6 +11,28 @@ class Type(Enum):
     EMPTY = 3
 
 
+# sides of a cell connected by each pipe, 0 is top, 1 is right, 2 is bottom and 3 is left, the same numbering is
+# used for the entry points of the solver
+OPENINGS = {
+    (Type.TURN, 0): (0, 1),  # ╚
+    (Type.TURN, 1): (1, 2),  # ╔
+    (Type.TURN, 2): (2, 3),  # ╗
+    (Type.TURN, 3): (0, 3),  # ╝
+    (Type.STRAIGHT, 0): (0, 2),  # ║
+    (Type.STRAIGHT, 1): (1, 3),  # ═
+}
+
+# x and y offsets to the neighbouring cell through each side
+SIDE_OFFSETS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+# orientations a pipe can take when entered from a side together with the side the water leaves through
+ROUTES = {}
+for (route_type, route_orientation), route_sides in OPENINGS.items():
+    for route_entry in route_sides:
+        route_exit = route_sides[1] if route_sides[0] == route_entry else route_sides[0]
+        ROUTES.setdefault((route_type, route_entry), []).append((route_orientation, route_exit))
+
+
 class Pipe:
     """
     Pipe class represents a pipe object, with the type x_cord, y_cord and orientation. Orientation ranges from
@@ -101,6 +123,13 @@ class Pipe:
                 raise Exception('Invalid orientation')
         self.orientation = new
 
+    def get_openings(self):
+        """
+        gets the sides of the cell connected by the pipe given its type and orientation
+        :return: tuple with the two connected sides, empty tuple for an empty pipe
+        """
+        return OPENINGS.get((self.type, self.orientation), ())
+
     def change_color(self):
         """
         changes color of pipe
@@ -128,6 +157,12 @@ class Game:
 
         self.row = len(matrix)
         self.col = len(matrix[0])
+        # cache used by update_cell, the winning path with the coordinates of its cells and the cells looked at by
+        # the last full search, None until the board has been solved
+        self.__path = None
+        self.__path_coords = None
+        self.__path_cells = None
+        self.__explored = None
 
     def valid_coord(self, x_cord, y_cord):
         """
@@ -152,6 +187,42 @@ class Game:
             final_str += tmp_str + "\n"
         return final_str
 
+    def get_type_grid(self):
+        """
+        packs the types of the pipes into bytes, one byte per cell row by row
+        :return: bytes with the value of the type of every pipe
+        """
+        return bytes(pipe.type.value for row in self.matrix for pipe in row)
+
+    def walk_route(self, orientation_of):
+        """
+        follows the water from the source through the pipes of the board, the water enters the top left cell from the
+        top and has to leave the bottom right cell through the right side. Every cell is visited at most once so the
+        walk is linear in the size of the board
+        :param orientation_of: function taking the x and y coordinates of a cell and returning the orientation of its
+        pipe, or None if the cell has no orientation
+        :return: list of [x, y, orientation] for every cell of the route, or None if the route is broken
+        """
+        destination = (self.col - 1, self.row - 1)
+        matrix = self.get_matrix()
+        seen = set()
+        route = []
+        x_cord, y_cord, entry_point = 0, 0, 0
+        while self.valid_coord(x_cord, y_cord) and (x_cord, y_cord) not in seen:
+            seen.add((x_cord, y_cord))
+            orientation = orientation_of(x_cord, y_cord)
+            openings = OPENINGS.get((matrix[y_cord][x_cord].type, orientation), ())
+            if entry_point not in openings:
+                return None
+            route.append([x_cord, y_cord, orientation])
+            exit_point = openings[0] if openings[1] == entry_point else openings[1]
+            if (x_cord, y_cord) == destination and exit_point == 1:
+                return route
+            x_cord += SIDE_OFFSETS[exit_point][0]
+            y_cord += SIDE_OFFSETS[exit_point][1]
+            entry_point = (exit_point + 2) % 4
+        return None
+
     def get_matrix(self):
         """
         getter for the game board
@@ -311,12 +382,260 @@ class Game:
         :return: list with the winning path
         """
         entry_point = 0
-        dictionary = self.__solve_helper(entry_point, 0, 0)
-        if dictionary:
-            return self.__retrieve_path(dictionary)
-        else:
+        explored = []
+        dictionary = self.__solve_helper(entry_point, 0, 0, explored)
+        path = self.__retrieve_path(dictionary) if dictionary else []
+        self.__set_path(path or [])
+        # the search only depends on the cells it looked at, edits anywhere else can not change its outcome
+        self.__explored = set((x_cord, y_cord) for x_cord, y_cord in explored)
+        return path
+
+    def get_type_masks(self):
+        """
+        converts the board into bitsets, bit y * col + x of a mask is set if the pipe at x, y has the mask's type
+        :return: tuple with the masks of the turn pipes and of the straight pipes
+        """
+        types = self.get_type_grid()
+        turn = int("".join("1" if elem == Type.TURN.value else "0" for elem in reversed(types)), 2)
+        straight = int("".join("1" if elem == Type.STRAIGHT.value else "0" for elem in reversed(types)), 2)
+        return turn, straight
+
+    def __frontier_helper(self, keep_layers: bool = False):
+        """
+        expands every reachable (cell, entry point) state of the board at once, one bitset per entry point, until the
+        water leaves the destination through the right side or no new state is reached. Each step moves the whole
+        frontier with a handful of shifts and masks instead of visiting the cells one at a time
+        :param keep_layers: whether to keep the states first reached at every step, needed to recover a path
+        :return: tuple with the entry point the destination is reached from or None, and the list of layers, each layer
+        being the bitsets of the states entered from the top, right, bottom and left first reached at that step
+        """
+        cells = self.row * self.col
+        full = (1 << cells) - 1
+        first_col = int(("0" * (self.col - 1) + "1") * self.row, 2)
+        last_col = first_col << (self.col - 1)
+        destination = 1 << (cells - 1)
+        turn, straight = self.get_type_masks()
+
+        # the water enters the source from the top
+        frontier = [1, 0, 0, 0]
+        reached = [1, 0, 0, 0]
+        layers = [frontier] if keep_layers else []
+        while any(frontier):
+            top, right, bottom, left = frontier
+            vertical = turn & (top | bottom)
+            horizontal = turn & (left | right)
+            exit_right = vertical | (straight & left)
+            if exit_right & destination:
+                return (3 if straight & left & destination else 0 if top & destination else 2), layers
+            exit_left = vertical | (straight & right)
+            exit_top = horizontal | (straight & bottom)
+            exit_bottom = horizontal | (straight & top)
+
+            # leaving a cell through one side enters the neighbouring cell from the opposite side
+            frontier = [((exit_bottom << self.col) & full) & ~reached[0],
+                        ((exit_left & ~first_col) >> 1) & ~reached[1],
+                        (exit_top >> self.col) & ~reached[2],
+                        ((exit_right & ~last_col) << 1) & ~reached[3]]
+            reached = [reached[ii] | frontier[ii] for ii in range(4)]
+            if keep_layers:
+                layers.append(frontier)
+        return None, layers
+
+    def is_solvable(self):
+        """
+        checks whether the water can reach the destination. The check allows a route to pass a cell more than once,
+        which a single pipe can't do, so false means the game can't be won while true still has to be confirmed by
+        get_winning_path, which makes it a cheap filter for boards that are not worth solving
+        :return: false if the game can't be won else true
+        """
+        return self.__frontier_helper()[0] is not None
+
+    def get_frontier_path(self):
+        """
+        recovers a shortest route from the layers of the frontier search by walking back from the destination
+        :return: list with the winning path, empty if the game can't be won, None if the shortest route passes a cell
+        more than once
+        """
+        entry_point, layers = self.__frontier_helper(True)
+        if entry_point is None:
             return []
 
+        cell = self.row * self.col - 1
+        exit_point = 1
+        path = []
+        for layer in range(len(layers) - 1, -1, -1):
+            x_cord, y_cord = cell % self.col, cell // self.col
+            pipe = self.matrix[y_cord][x_cord]
+            for orientation, route_exit in ROUTES[(pipe.type, entry_point)]:
+                if route_exit == exit_point:
+                    valid_pipe = pipe.copy_pipe()
+                    valid_pipe.change_orientation(orientation)
+                    path.append(valid_pipe)
+                    break
+            if layer == 0:
+                break
+
+            # the previous cell is behind the entry point and was entered at the previous step from any side that
+            # leads to this cell
+            exit_point = (entry_point + 2) % 4
+            cell += (SIDE_OFFSETS[entry_point][1] * self.col) + SIDE_OFFSETS[entry_point][0]
+            x_cord, y_cord = cell % self.col, cell // self.col
+            pipe_type = self.matrix[y_cord][x_cord].type
+            for prev_entry in range(4):
+                if layers[layer - 1][prev_entry] >> cell & 1 and \
+                        any(route_exit == exit_point for _, route_exit in ROUTES.get((pipe_type, prev_entry), [])):
+                    entry_point = prev_entry
+                    break
+
+        path.reverse()
+        if len(set((pipe.xcord, pipe.ycord) for pipe in path)) != len(path):
+            return None
+        return path
+
+    def get_cached_path(self):
+        """
+        gets the winning path kept up to date by update_cell, the board is solved first if it has not been yet
+        :return: list with the winning path, empty if the game can not be won
+        """
+        if self.__path is None:
+            self.get_winning_path()
+        return self.__path
+
+    def update_cell(self, x_cord: int, y_cord: int, pipe_type: Type, radius: int = 4):
+        """
+        changes the pipe in a cell and checks whether the game can still be won. Only the part of the cached solution
+        affected by the edit is looked at: edits off the winning path keep it, edits on the path are repaired by a
+        search around the edited cell and the board is only solved again from scratch when the repair fails. If the
+        game could not be won, edits outside the cells explored by the last search can not change that.
+        :param x_cord: the x coordinate of the cell
+        :param y_cord: the y coordinate of the cell
+        :param pipe_type: new type of pipe for the cell
+        :param radius: how far from the edited cell the repair may search
+        :return: true if the game can be won after the edit else false
+        """
+        if not self.valid_coord(x_cord, y_cord):
+            raise Exception("Invalid coordinates")
+        self.matrix[y_cord][x_cord] = Pipe(pipe_type, x_cord, y_cord)
+
+        if self.__path is None:
+            return bool(self.get_cached_path())
+        if not self.__path:
+            if (x_cord, y_cord) not in self.__explored:
+                return False
+            return bool(self.get_winning_path())
+        if (x_cord, y_cord) not in self.__path_cells:
+            return True
+        index = self.__path_coords.index((x_cord, y_cord))
+        if self.__path[index].type == pipe_type:
+            return True
+        if self.__repair_path(index, radius):
+            return True
+        return bool(self.get_winning_path())
+
+    def __set_path(self, path: list):
+        """
+        stores the winning path in the cache used by update_cell
+        :param path: list with the winning path
+        """
+        self.__path = path
+        self.__path_coords = [(pipe.xcord, pipe.ycord) for pipe in path]
+        self.__path_cells = set(self.__path_coords)
+        self.__explored = None
+
+    def __path_entry(self, index: int):
+        """
+        gets the side the water enters a cell of the cached path from
+        :param index: position of the cell in the path
+        :return: entry point into the cell, 0 top, 1 right, 2 bottom, 3 left
+        """
+        if index == 0:
+            return 0
+        x_cord, y_cord = self.__path_coords[index]
+        prev_x, prev_y = self.__path_coords[index - 1]
+        return SIDE_OFFSETS.index((prev_x - x_cord, prev_y - y_cord))
+
+    def __path_exit(self, index: int):
+        """
+        gets the side the water leaves a cell of the cached path through
+        :param index: position of the cell in the path
+        :return: exit point of the cell, 0 top, 1 right, 2 bottom, 3 left
+        """
+        if index == len(self.__path) - 1:
+            return 1
+        x_cord, y_cord = self.__path_coords[index]
+        next_x, next_y = self.__path_coords[index + 1]
+        return SIDE_OFFSETS.index((next_x - x_cord, next_y - y_cord))
+
+    def __repair_path(self, index: int, radius: int):
+        """
+        reconnects the cached path after the pipe at the given position changed. A detour is searched that leaves the
+        path at the edited cell or one of the cells shortly before it and joins the path again at a later cell,
+        staying within radius cells of the edit and off the rest of the path
+        :param index: position of the edited cell in the path
+        :param radius: how far from the edited cell the detour may go
+        :return: true if the path was repaired else false
+        """
+        center_x, center_y = self.__path_coords[index]
+        for start in range(index, max(0, index - radius) - 1, -1):
+            x_cord, y_cord = self.__path_coords[start]
+            detour = self.__repair_helper(self.__path_entry(start), x_cord, y_cord, index,
+                                          (center_x, center_y, radius), [], set())
+            if detour:
+                join = self.__path_coords.index((detour[-1].xcord, detour[-1].ycord)) + 1 \
+                    if (detour[-1].xcord, detour[-1].ycord) in self.__path_cells else len(self.__path)
+                for pipe in self.__path[start:join]:
+                    self.__path_cells.discard((pipe.xcord, pipe.ycord))
+                self.__path[start:join] = detour
+                self.__path_coords[start:join] = [(pipe.xcord, pipe.ycord) for pipe in detour]
+                self.__path_cells.update(self.__path_coords[start:start + len(detour)])
+                return True
+        return False
+
+    def __repair_helper(self, entry_point: int, x_cord: int, y_cord: int, index: int, window: tuple, acc: list,
+                        seen: set):
+        """
+        searches for a detour by trying every orientation of the pipes cell by cell, backtracking when a cell can not
+        lead anywhere. The first cell of the detour may be on the path, any later cell of the path reached after the
+        edited cell ends the detour if its pipe can be turned to continue along the path
+        :param entry_point: entry point into the cell at x_cord, y_cord
+        :param x_cord: the x coordinate of the cell
+        :param y_cord: the y coordinate of the cell
+        :param index: position of the edited cell in the path
+        :param window: x and y coordinates of the edited cell and the radius the detour has to stay within
+        :param acc: pipes of the detour so far
+        :param seen: coordinates of the cells of the detour so far
+        :return: list with the pipes of the detour, the last one being the pipe where it joins the path, or None
+        """
+        center_x, center_y, radius = window
+        if not self.valid_coord(x_cord, y_cord) or (x_cord, y_cord) in seen or \
+                abs(x_cord - center_x) > radius or abs(y_cord - center_y) > radius:
+            return None
+        pipe = self.matrix[y_cord][x_cord]
+        join = None
+        if acc and (x_cord, y_cord) in self.__path_cells:
+            join = self.__path_coords.index((x_cord, y_cord))
+            # the edited cell itself can only be joined when it is the destination
+            if join < index or (join == index and index != len(self.__path) - 1):
+                return None
+
+        for orientation, exit_point in ROUTES.get((pipe.type, entry_point), []):
+            valid_pipe = pipe.copy_pipe()
+            valid_pipe.change_orientation(orientation)
+            if join is not None:
+                if exit_point == self.__path_exit(join):
+                    return acc + [valid_pipe]
+                continue
+            if (x_cord, y_cord) == (self.col - 1, self.row - 1) and exit_point == 1:
+                return acc + [valid_pipe]
+            seen.add((x_cord, y_cord))
+            detour = self.__repair_helper((exit_point + 2) % 4, x_cord + SIDE_OFFSETS[exit_point][0],
+                                          y_cord + SIDE_OFFSETS[exit_point][1], index, window, acc + [valid_pipe],
+                                          seen)
+            seen.discard((x_cord, y_cord))
+            if detour:
+                return detour
+        return None
+
     def generate_path(self, moves: list):
         """
         generates the given path on the game board
@@ -0,0 +1,190 @@
+import json
+import sqlite3
+import struct
+from matrix import Game
+from matrix import Type
+from matrix import Pipe
+
+# number of fingerprints looked up per query, stays below the limit sqlite puts on the parameters of a statement
+CHUNK_SIZE = 500
+
+# maps the value of every type to its base 4 digit, used to pack a type grid in a single pass
+DIGITS = bytes.maketrans(bytes(range(4)), b"0123")
+
+# orientation of every pipe once the board is mirrored along the anti diagonal, top swaps with right and bottom with
+# left so ╚ and ╗ stay the same, ╔ and ╝ swap and so do ║ and ═
+MIRRORED = {
+    Type.TURN: {0: 0, 1: 3, 2: 2, 3: 1},
+    Type.STRAIGHT: {0: 1, 1: 0},
+}
+
+
+def mirror_grid(types: bytes, rows: int, cols: int):
+    """
+    mirrors a packed type grid along the anti diagonal. The source in the top left cell, entered from the top, and the
+    destination in the bottom right cell, left through the right side, swap places so a board and its mirror image are
+    either both solvable or both not, with the path of one being the reversed and mirrored path of the other
+    :param types: packed type grid of the board, one byte per cell row by row
+    :param rows: number of rows of the board
+    :param cols: number of columns of the board
+    :return: packed type grid of the mirrored board, which has cols rows and rows columns
+    """
+    # cell x, y of the mirrored board is cell cols - 1 - y, rows - 1 - x of the original, so every row of the mirrored
+    # board is a column of the original read from the bottom up
+    return b"".join(types[cols - 1 - y_cord::cols][::-1] for y_cord in range(cols))
+
+
+def pack_grid(types: bytes, rows: int, cols: int):
+    """
+    packs a type grid into two bits per cell behind the dimensions of the board
+    :param types: packed type grid of the board, one byte per cell row by row
+    :param rows: number of rows of the board
+    :param cols: number of columns of the board
+    :return: bytes identifying the board
+    """
+    # the first cell ends up in the lowest two bits
+    value = int(types[::-1].translate(DIGITS) or b"0", 4)
+    return struct.pack(">II", rows, cols) + value.to_bytes((len(types) + 3) // 4, "little")
+
+
+def fingerprint(game: Game):
+    """
+    computes the canonical fingerprint of a board, a board and its mirror image along the anti diagonal share the same
+    fingerprint
+    :param game: game to be fingerprinted
+    :return: tuple with the fingerprint and whether the board is the mirrored form of the canonical board
+    """
+    types = game.get_type_grid()
+    key = pack_grid(types, game.row, game.col)
+    mirrored_key = pack_grid(mirror_grid(types, game.row, game.col), game.col, game.row)
+    if mirrored_key < key:
+        return mirrored_key, True
+    return key, False
+
+
+def mirror_path(path: list, rows: int, cols: int, types: bytes):
+    """
+    converts a path between a board and its mirror image along the anti diagonal
+    :param path: list of [x, y, orientation] in the order the water flows on the board the path was found on
+    :param rows: number of rows of the board the path was found on
+    :param cols: number of columns of the board the path was found on
+    :param types: packed type grid of the mirrored board
+    :return: list of [x, y, orientation] on the mirrored board
+    """
+    mirrored = []
+    for x_cord, y_cord, orientation in reversed(path):
+        new_x, new_y = rows - 1 - y_cord, cols - 1 - x_cord
+        mirrored.append([new_x, new_y, MIRRORED[Type(types[new_y * rows + new_x])][orientation]])
+    return mirrored
+
+
+class ResultStore:
+    """
+    ResultStore keeps the results of solved boards in a sqlite database so boards seen before, or their mirror images,
+    are never solved twice. Results are kept per engine since the engines do not always agree.
+    """
+
+    def __init__(self, filename: str = "results.db"):
+        """
+        Constructor for the ResultStore class
+        :param filename: name of the database file, ":memory:" keeps the results for the lifetime of the store only
+        """
+        self.connection = sqlite3.connect(filename)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS results (fingerprint BLOB NOT NULL, engine TEXT NOT NULL, "
+                                "solvable INTEGER NOT NULL, path TEXT, seconds REAL, "
+                                "PRIMARY KEY (fingerprint, engine))")
+        self.connection.commit()
+
+    def __to_record(self, game: Game, mirrored: bool, row):
+        """
+        converts a row of the database to a result for the given board
+        :param game: game the result is for
+        :param mirrored: whether the board is the mirrored form of the canonical board
+        :param row: tuple with the solvable status, path and seconds
+        :return: dictionary with the solvable status, the path as a list of pipes and the seconds it took to solve
+        """
+        solvable, path, seconds = row
+        path = json.loads(path) if path else []
+        if mirrored:
+            path = mirror_path(path, game.col, game.row, game.get_type_grid())
+        matrix = game.get_matrix()
+        return {
+            "solvable": bool(solvable),
+            "path": [Pipe(matrix[y_cord][x_cord].type, x_cord, y_cord, orientation)
+                     for x_cord, y_cord, orientation in path],
+            "seconds": seconds,
+        }
+
+    def __to_row(self, game: Game, engine: str, solvable: bool, path: list, seconds: float, key: tuple = None):
+        """
+        converts a result to a row of the database
+        :param game: game that was solved
+        :param engine: name of the engine that solved the board
+        :param solvable: whether the engine found a solution
+        :param path: list of pipes of the winning path
+        :param seconds: time it took to solve the board
+        :param key: fingerprint of the game as returned by fingerprint, computed when None
+        :return: tuple with the values of the columns
+        """
+        key, mirrored = fingerprint(game) if key is None else key
+        path = [[pipe.xcord, pipe.ycord, pipe.orientation] for pipe in path or []]
+        if mirrored:
+            # the path is stored for the canonical board
+            path = mirror_path(path, game.row, game.col, mirror_grid(game.get_type_grid(), game.row, game.col))
+        return key, engine, int(solvable), json.dumps(path) if path else None, seconds
+
+    def lookup(self, game: Game, engine: str):
+        """
+        looks up the result of a board
+        :param game: game to be looked up
+        :param engine: name of the engine that solved the board
+        :return: dictionary with the solvable status, path and seconds, or None if the board has not been solved
+        """
+        return self.lookup_many([game], engine)[0]
+
+    def lookup_many(self, games: list, engine: str, keys: list = None):
+        """
+        looks up the results of many boards in as few queries as possible
+        :param games: games to be looked up
+        :param engine: name of the engine that solved the boards
+        :param keys: fingerprint of every game as returned by fingerprint, computed when None
+        :return: list with a result or None for every game, in the same order
+        """
+        keys = [fingerprint(game) for game in games] if keys is None else keys
+        unique = list(set(key for key, _ in keys))
+        rows = {}
+        for ii in range(0, len(unique), CHUNK_SIZE):
+            chunk = unique[ii:ii + CHUNK_SIZE]
+            query = "SELECT fingerprint, solvable, path, seconds FROM results WHERE engine = ? AND fingerprint IN (" + \
+                    ", ".join("?" * len(chunk)) + ")"
+            for row in self.connection.execute(query, [engine] + chunk):
+                rows[bytes(row[0])] = row[1:]
+        return [self.__to_record(game, mirrored, rows[key]) if key in rows else None
+                for game, (key, mirrored) in zip(games, keys)]
+
+    def insert(self, game: Game, engine: str, solvable: bool, path: list = None, seconds: float = None):
+        """
+        stores the result of a board, replacing any earlier result of the same engine
+        :param game: game that was solved
+        :param engine: name of the engine that solved the board
+        :param solvable: whether the engine found a solution
+        :param path: list of pipes of the winning path
+        :param seconds: time it took to solve the board
+        """
+        self.insert_many([(game, engine, solvable, path, seconds)])
+
+    def insert_many(self, results: list):
+        """
+        stores the results of many boards in a single transaction
+        :param results: list of tuples with the game, engine, solvable status, path and seconds, optionally followed by
+        the fingerprint of the game
+        """
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                                        [self.__to_row(*result) for result in results])
+
+    def close(self):
+        """
+        closes the database
+        """
+        self.connection.close()
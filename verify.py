@@ -0,0 +1,54 @@
+from matrix import Game
+from main import decode_rotation
+from main import get_index
+from main import get_int_index
+
+
+def verify_path(game: Game, path: list):
+    """
+    checks that a path returned by Game.get_winning_path connects the source to the destination
+    :param game: game board the path was found on
+    :param path: list of pipes in the order the water flows through them
+    :return: true if the path is a connected, in bounds route from source to destination else false
+    """
+    if not path:
+        return False
+    matrix = game.get_matrix()
+    steps = {}
+    for pipe in path:
+        if not game.valid_coord(pipe.xcord, pipe.ycord) or (pipe.xcord, pipe.ycord) in steps:
+            return False
+        if pipe.type != matrix[pipe.ycord][pipe.xcord].type:
+            return False
+        steps[(pipe.xcord, pipe.ycord)] = pipe.orientation
+
+    route = game.walk_route(lambda x_cord, y_cord: steps.get((x_cord, y_cord)))
+    return route is not None and len(route) == len(path) and \
+        all(step[0] == pipe.xcord and step[1] == pipe.ycord for step, pipe in zip(route, path))
+
+
+def verify_solution(game: Game, solution: list):
+    """
+    checks that an orientation assignment returned by the sat solver connects the source to the destination, the board
+    itself is not modified
+    :param game: game board the solution was found for
+    :param solution: positive literals of the model in the order expected by parse_solution, one per cell
+    :return: true if the assignment contains a connected, in bounds route from source to destination else false
+    """
+    dimension = game.col
+    if solution is None or len(solution) != game.row * game.col:
+        return False
+    matrix = game.get_matrix()
+
+    def orientation_of(x_cord, y_cord):
+        ii = get_int_index(dimension, x_cord, y_cord)
+        elem = solution[ii]
+        # the literal has to belong to the cell it is read for, otherwise the model is misaligned
+        if elem // 10 != int(get_index(game.row * game.col, ii)):
+            return None
+        try:
+            return decode_rotation(matrix[y_cord][x_cord].type, elem % 10)
+        except Exception:
+            return None
+
+    return game.walk_route(orientation_of) is not None